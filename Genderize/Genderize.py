@@ -1,5 +1,3 @@
-from tensorflow.keras.models import load_model
-
 import pandas as pd
 
 import numpy as np
@@ -12,7 +10,7 @@ import re
 
  
 
-from pyspark.sql import functions as F
+_CLEAN_RE = re.compile(r"[^a-z0-9 ]+")
 
  
 
@@ -68,6 +66,8 @@ class LatamGenderize:
 
     def __load_model(self, modelPath):
 
+        from tensorflow.keras.models import load_model
+
         try:
 
             return load_model(modelPath)
@@ -82,7 +82,7 @@ class LatamGenderize:
 
         serie_names = df[name_column].copy()
 
-        clean_name  = serie_names.apply(lambda x: re.sub(r"[^a-z0-9 ]+", "", unidecode.unidecode(x.lower())))
+        clean_name  = serie_names.apply(lambda x: _CLEAN_RE.sub("", unidecode.unidecode(x.lower())))
 
         trf_names   = [list(name) for name in clean_name]
 
@@ -0,0 +1,41 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled character encoding for cleaned names.
+
+Reads the UTF-8 buffer of each name in place instead of building
+per-character Python objects.
+"""
+
+from cpython.unicode cimport PyUnicode_AsUTF8AndSize
+
+
+def encode_batch(list names, float[:, ::1] out):
+    """
+    Encode cleaned names into a preallocated array.
+    
+    Characters are encoded as a=1, b=2, ..., z=26 and everything else
+    (spaces, digits and padding) as 0. Names longer than ``out.shape[1]``
+    are truncated.
+    
+    Args:
+        names: Cleaned names containing only ``[a-z0-9 ]`` characters
+        out: Float32 array of shape (len(names), name_length) to write into
+    """
+    cdef Py_ssize_t i, j, size
+    cdef Py_ssize_t name_length = out.shape[1]
+    cdef const char *data
+    cdef float value
+    
+    if len(names) != out.shape[0]:
+        raise ValueError(
+            f"Expected {out.shape[0]} names, got {len(names)}"
+        )
+    
+    for i in range(out.shape[0]):
+        data = PyUnicode_AsUTF8AndSize(names[i], &size)
+        for j in range(name_length):
+            if j < size:
+                value = <unsigned char>data[j] - 96.0
+                out[i, j] = value if value > 0.0 else 0.0
+            else:
+                out[i, j] = 0.0
@@ -7,13 +7,234 @@ to predict gender based on Latin American names using machine learning models.
 
 import os
 import re
-from typing import List, Optional, Union
+import tempfile
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from tensorflow.keras.models import load_model
 import unidecode
 
+try:
+    import numba
+except ImportError:  # numba is optional; fall back to NumPy
+    numba = None
+
+try:
+    from ._encode import encode_batch as _encode_batch
+except ImportError:  # compiled extension is optional; fall back to _encode_ascii
+    _encode_batch = None
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+
+# Fixed number of characters each name is padded/truncated to
+_NAME_LENGTH = 50
+
+# Default number of names sent to the model per inference call
+_DEFAULT_BATCH_SIZE = 4096
+
+# ASCII codes the predicted gender labels are computed as
+_MALE_CODE = ord("M")
+_FEMALE_CODE = ord("F")
+
+# Number of random encoded names used to calibrate int8 quantization
+_CALIBRATION_SAMPLES = 100
+
+# Encoded value of every byte: a=1, b=2, ..., z=26 and 0 for everything else
+_CHAR_LUT = np.maximum(np.arange(256, dtype=np.float32) - 96.0, 0.0)
+
+# Characters kept in cleaned names; everything else is stripped
+_CLEAN_RE = re.compile(r"[^a-z0-9 ]+")
+
+# Element-wise unidecode over an object ndarray, avoiding per-row Series.apply
+_unidecode = np.frompyfunc(unidecode.unidecode, 1, 1)
+
+
+def _encode_ascii_numpy(buf: np.ndarray, out: np.ndarray) -> None:
+    """Encode a flat buffer of padded ASCII names into out (a=1, ..., z=26)."""
+    # Plain arithmetic vectorizes better than a _CHAR_LUT gather in NumPy
+    out[...] = buf.reshape(out.shape)
+    np.subtract(out, 96.0, out=out)
+    np.maximum(out, 0.0, out=out)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _encode_ascii(buf: np.ndarray, out: np.ndarray) -> None:
+        """Numba version of _encode_ascii_numpy."""
+        name_length = out.shape[1]
+        for i in numba.prange(out.shape[0]):
+            for j in range(name_length):
+                out[i, j] = _CHAR_LUT[buf[i * name_length + j]]
+else:
+    _encode_ascii = _encode_ascii_numpy
+
+
+def _clean_names(names: np.ndarray) -> np.ndarray:
+    """Lowercase names, transliterate them to ASCII and strip other characters."""
+    # Work on object arrays: a fixed-width unicode array would be sized by the
+    # longest name in the column
+    lower_names = pd.Series(names, dtype=object).str.lower().to_numpy(dtype=object)
+    clean_names = pd.Series(_unidecode(lower_names), dtype=object).str.replace(
+        _CLEAN_RE, "", regex=True
+    )
+    return clean_names.to_numpy(dtype=object)
+
+
+def _encode_names(clean_names: np.ndarray, out: np.ndarray) -> None:
+    """Encode cleaned names into out (a=1, ..., z=26, space=0)."""
+    if _encode_batch is not None:
+        # Compiled path: reads each string's buffer in place
+        _encode_batch(clean_names.tolist(), out)
+    else:
+        # Pad names to fixed length and view them as a single ASCII buffer
+        padded_names = "".join(
+            name.ljust(_NAME_LENGTH)[:_NAME_LENGTH] for name in clean_names
+        )
+        _encode_ascii(np.frombuffer(padded_names.encode("ascii"), dtype=np.uint8), out)
+
+
+def _build_fold_table() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map every Latin-1 code point to its cleaned ASCII bytes.
+    
+    Each character goes through the same lower/unidecode/_CLEAN_RE steps as
+    _clean_names, so cleaning a Latin-1 name character by character with this
+    table gives exactly the same result.
+    
+    Returns:
+        Tuple of a (256, width) uint8 table holding the cleaned bytes of each
+        code point and a (256,) array with the number of bytes used
+    """
+    folds = [
+        _CLEAN_RE.sub("", unidecode.unidecode(chr(code_point).lower())).encode("ascii")
+        for code_point in range(256)
+    ]
+    fold_lengths = np.array([len(fold) for fold in folds], dtype=np.uint8)
+    fold_table = np.zeros((256, fold_lengths.max()), dtype=np.uint8)
+    for code_point, fold in enumerate(folds):
+        fold_table[code_point, :len(fold)] = np.frombuffer(fold, dtype=np.uint8)
+    return fold_table, fold_lengths
+
+
+if numba is not None:
+    _FOLD_TABLE, _FOLD_LENGTHS = _build_fold_table()
+    
+    @numba.njit(parallel=True, cache=True)
+    def _fold_encode(
+        code_points: np.ndarray,
+        offsets: np.ndarray,
+        fold_table: np.ndarray,
+        fold_lengths: np.ndarray,
+        clean: np.ndarray,
+        out: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Clean and encode names in a single pass over their code points.
+        
+        Name i spans code_points[offsets[i]:offsets[i + 1]]. Writes the
+        cleaned ASCII bytes of each name into the zero-filled clean array and
+        its encoding into out. Returns a mask of the names containing
+        characters outside Latin-1 or cleaning to more characters than clean
+        holds, which are left untouched.
+        """
+        needs_fallback = np.zeros(clean.shape[0], dtype=np.bool_)
+        for i in numba.prange(clean.shape[0]):
+            size = 0
+            for j in range(offsets[i], offsets[i + 1]):
+                code_point = code_points[j]
+                if (code_point > 255
+                        or size + fold_lengths[code_point] > clean.shape[1]):
+                    needs_fallback[i] = True
+                    break
+                for k in range(fold_lengths[code_point]):
+                    clean[i, size] = fold_table[code_point, k]
+                    size += 1
+            for j in range(out.shape[1]):
+                out[i, j] = _CHAR_LUT[clean[i, j]] if j < size else 0.0
+        return needs_fallback
+
+
+def _fold_clean_encode(names: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Clean and encode names with the single-pass Numba kernel.
+    
+    Names with characters outside Latin-1 or longer than _NAME_LENGTH once
+    cleaned go through _clean_names and _encode_names instead, so the
+    temporary cleaned buffer stays at _NAME_LENGTH bytes per name however
+    long the longest name is.
+    
+    Args:
+        names: Object ndarray of raw names
+        out: Float32 array of shape (len(names), 50) for the encoded names
+    
+    Returns:
+        Object ndarray with the cleaned names
+    """
+    # Concatenate all code points into one flat buffer with per-name offsets,
+    # so memory follows the total length of the names rather than the number
+    # of names times the longest one
+    offsets = np.zeros(len(names) + 1, dtype=np.intp)
+    np.cumsum(
+        np.fromiter(map(len, names), dtype=np.intp, count=len(names)),
+        out=offsets[1:],
+    )
+    code_points = np.frombuffer(
+        "".join(names).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+    )
+    clean = np.zeros((len(names), out.shape[1]), dtype=np.uint8)
+    needs_fallback = _fold_encode(
+        code_points, offsets, _FOLD_TABLE, _FOLD_LENGTHS, clean, out
+    )
+    
+    # Zero padding is dropped when viewing each row as a bytes value
+    clean_names = clean.view(f"S{clean.shape[1]}").ravel().astype(str).astype(object)
+    
+    if needs_fallback.any():
+        fallback_names = _clean_names(names[needs_fallback])
+        fallback_encoded = np.empty((len(fallback_names), out.shape[1]), out.dtype)
+        _encode_names(fallback_names, fallback_encoded)
+        clean_names[needs_fallback] = fallback_names
+        out[needs_fallback] = fallback_encoded
+    
+    return clean_names
+
+
+def _summarize_predictions(predictions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce model outputs to gender label codes and rounded percentages.
+    
+    Host-side counterpart of the reduction done on the device for TensorFlow
+    inference, used for TensorFlow Lite outputs.
+    
+    Args:
+        predictions: Array of shape (n,) with the model output for each name
+    
+    Returns:
+        Tuple of uint8 arrays with the ASCII code of the predicted gender and
+        the probability of that gender as a whole percentage
+    """
+    is_male = predictions > 0.5
+    labels = np.where(is_male, _MALE_CODE, _FEMALE_CODE).astype(np.uint8)
+    probabilities = np.where(is_male, predictions, 1.0 - predictions)
+    return labels, np.round(probabilities * 100.0).astype(np.uint8)
+
+
+def _pad_batch(batch: np.ndarray, batch_size: int) -> np.ndarray:
+    """Zero-pad a batch to the next power of two rows, capped at batch_size."""
+    padded_size = min(1 << (len(batch) - 1).bit_length(), batch_size)
+    if padded_size == len(batch):
+        return batch
+    padding = np.zeros((padded_size - len(batch), batch.shape[1]), batch.dtype)
+    return np.concatenate([batch, padding])
+
+
+def _representative_dataset() -> Iterator[List[np.ndarray]]:
+    """Yield random encoded names to calibrate int8 quantization."""
+    rng = np.random.default_rng(0)
+    for _ in range(_CALIBRATION_SAMPLES):
+        yield [rng.integers(0, 27, size=(1, _NAME_LENGTH)).astype(np.float32)]
+
 
 class LatamGenderize:
     """
@@ -26,20 +247,45 @@ class LatamGenderize:
     Attributes:
         _model: The loaded TensorFlow model for gender prediction
         _model_path: Path to the model file
+        _predict_fn: Compiled inference function wrapping the model call
+        _jit_compile: Whether _predict_fn is compiled with XLA
+        _interpreter: TensorFlow Lite interpreter, or None to use TensorFlow
+        _input_details: Details of the interpreter input tensor, or None
+        _output_details: Details of the interpreter output tensor, or None
+        _interpreter_shape: Input shape the interpreter tensors are currently
+                           allocated for, or None before the first batch
     """
     
-    def __init__(self, model_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        use_tflite: bool = False,
+        quantized: bool = False,
+        jit_compile: bool = True,
+    ) -> None:
         """
         Initialize the LatamGenderize instance.
         
         Args:
             model_path: Optional path to a custom model file. If not provided,
                        uses the default model included with the package.
+            use_tflite: If True, run inference with a TensorFlow Lite version
+                       of the model, which has much lower per-call overhead
+                       on CPU. The converted model is cached next to the
+                       model file.
+            quantized: If True, run inference with an int8-quantized
+                       TensorFlow Lite version of the model. Implies
+                       use_tflite and trades a little accuracy for speed.
+            jit_compile: If True, compile the TensorFlow inference graph with
+                        XLA. Set to False for models using operations XLA
+                        does not support; inference still runs as a graph.
         
         Raises:
             FileNotFoundError: If the model file cannot be found
-            Exception: If there's an error loading the model
+            Exception: If there's an error loading or converting the model
         """
+        import tensorflow as tf
+        
         if model_path is None:
             # Get the directory where this package is installed
             package_dir = os.path.dirname(os.path.abspath(__file__))
@@ -47,8 +293,50 @@ class LatamGenderize:
         
         self._model_path = model_path
         self._model = self._load_model(model_path)
+        self._jit_compile = jit_compile
+        
+        def predict_on_device(x: "tf.Tensor") -> Tuple["tf.Tensor", "tf.Tensor"]:
+            # Threshold on the device so only one byte per name for the label
+            # and one for the rounded probability are copied back to the host
+            predictions = self._model(x, training=False)[:, 0]
+            is_male = predictions > 0.5
+            labels = tf.where(
+                is_male,
+                tf.constant(_MALE_CODE, tf.uint8),
+                tf.constant(_FEMALE_CODE, tf.uint8),
+            )
+            probabilities = tf.where(is_male, predictions, 1.0 - predictions)
+            return labels, tf.cast(tf.round(probabilities * 100.0), tf.uint8)
+        
+        # Call the model directly through a graph function instead of
+        # Model.predict, whose per-call overhead dominates small batches.
+        # This gives graph-mode latency without a process-wide
+        # tf.compat.v1.disable_eager_execution(), which would break .numpy()
+        # and tf.data for the rest of the program. The fixed input signature
+        # avoids retracing on new batch sizes, but XLA still compiles one
+        # executable per concrete shape, so _run_model pads the last batch
+        # to a power of two.
+        self._predict_fn = tf.function(
+            predict_on_device,
+            jit_compile=jit_compile,
+            input_signature=[tf.TensorSpec([None, _NAME_LENGTH], tf.float32)],
+        )
+        
+        self._interpreter = None
+        self._input_details: Optional[Dict[str, Any]] = None
+        self._output_details: Optional[Dict[str, Any]] = None
+        self._interpreter_shape: Optional[Tuple[int, ...]] = None
+        if use_tflite or quantized:
+            self._interpreter = self._load_interpreter(model_path, quantized)
+            self._input_details = self._interpreter.get_input_details()[0]
+            self._output_details = self._interpreter.get_output_details()[0]
     
-    def genderize(self, df: pd.DataFrame, name_column: Optional[str] = None) -> pd.DataFrame:
+    def genderize(
+        self,
+        df: pd.DataFrame,
+        name_column: Optional[str] = None,
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+    ) -> pd.DataFrame:
         """
         Predict gender for names in a DataFrame.
         
@@ -56,6 +344,10 @@ class LatamGenderize:
             df: DataFrame containing names to predict gender for
             name_column: Name of the column containing the names. If None,
                         will attempt to auto-detect the column name.
+            batch_size: Maximum number of names sent to the model at once.
+                       Bounds the memory used by model inputs and
+                       activations; the encoded names of the whole
+                       DataFrame (200 bytes per row) are still kept.
         
         Returns:
             DataFrame with original data plus gender prediction columns:
@@ -63,9 +355,13 @@ class LatamGenderize:
             - gender_probability: Confidence score (0.0 to 1.0)
         
         Raises:
-            ValueError: If no valid name column is found
+            ValueError: If no valid name column is found or batch_size is
+                       not positive
             Exception: If there's an error during prediction
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        
         if name_column is None:
             name_column = self._identify_column_name(df.columns.tolist())
         
@@ -73,15 +369,10 @@ class LatamGenderize:
             raise ValueError(f"Column '{name_column}' not found in DataFrame")
         
         # Preprocess the data
-        df_processed = self._preprocess(df, name_column)
+        clean_names, input_data = self._preprocess(df, name_column)
         
         # Make predictions
-        df_result = self._predict(df_processed)
-        
-        # Clean up temporary columns
-        df_result.drop(['clean_name_nlp', 'transform_name_nlp'], axis=1, inplace=True)
-        
-        return df_result
+        return self._predict(df, clean_names, input_data, batch_size)
     
     def _identify_column_name(self, columns: List[str]) -> str:
         """
@@ -128,12 +419,83 @@ class LatamGenderize:
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found: {model_path}")
         
+        # Imported lazily: TensorFlow takes seconds to initialize and is only
+        # needed once a model is actually loaded
+        from tensorflow.keras.models import load_model
+        
         try:
             return load_model(model_path)
         except Exception as e:
             raise Exception(f"Error loading model from {model_path}: {str(e)}") from e
     
-    def _preprocess(self, df: pd.DataFrame, name_column: str) -> pd.DataFrame:
+    def _load_interpreter(
+        self, model_path: str, quantized: bool = False
+    ) -> "tf.lite.Interpreter":
+        """
+        Build a TensorFlow Lite interpreter for the loaded model.
+        
+        The converted model is cached as a ``.tflite`` file (``_int8.tflite``
+        when quantized) next to the model file and reused while it is newer
+        than the model.
+        
+        Args:
+            model_path: Path to the model file the interpreter is built from
+            quantized: Whether to apply full int8 post-training quantization
+        
+        Returns:
+            TensorFlow Lite interpreter for the model
+        
+        Raises:
+            Exception: If the model cannot be converted to TensorFlow Lite
+        """
+        import tensorflow as tf
+        
+        suffix = "_int8.tflite" if quantized else ".tflite"
+        tflite_path = os.path.splitext(model_path)[0] + suffix
+        
+        if (os.path.exists(tflite_path)
+                and os.path.getmtime(tflite_path) >= os.path.getmtime(model_path)):
+            with open(tflite_path, "rb") as fh:
+                model_content = fh.read()
+        else:
+            try:
+                converter = tf.lite.TFLiteConverter.from_keras_model(self._model)
+                if quantized:
+                    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                    converter.representative_dataset = _representative_dataset
+                    converter.target_spec.supported_ops = [
+                        tf.lite.OpsSet.TFLITE_BUILTINS_INT8
+                    ]
+                    converter.inference_input_type = tf.int8
+                model_content = converter.convert()
+            except Exception as e:
+                raise Exception(
+                    f"Error converting model from {model_path} "
+                    f"to TensorFlow Lite: {str(e)}"
+                ) from e
+            
+            # Write to a temporary file and rename it into place, so other
+            # processes never read a partially written model
+            try:
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(tflite_path) or ".", suffix=".tmp"
+                )
+            except OSError:
+                # Read-only install location: keep using the in-memory model
+                pass
+            else:
+                try:
+                    with os.fdopen(fd, "wb") as fh:
+                        fh.write(model_content)
+                    os.replace(tmp_path, tflite_path)
+                except OSError:
+                    os.remove(tmp_path)
+        
+        return tf.lite.Interpreter(model_content=model_content)
+    
+    def _preprocess(
+        self, df: pd.DataFrame, name_column: str
+    ) -> Tuple[pd.Series, np.ndarray]:
         """
         Preprocess names for model input.
         
@@ -142,64 +504,155 @@ class LatamGenderize:
             name_column: Name of the column containing names
         
         Returns:
-            DataFrame with additional preprocessing columns
+            Tuple of the categorical Series of clean names (aligned with df)
+            and a float32 array of shape (n, 50) with the encoded names
         """
-        # Create a copy to avoid modifying the original
-        df_copy = df.copy()
-        
-        # Clean names: remove special characters and normalize
-        clean_names = df_copy[name_column].apply(
-            lambda x: re.sub(r"[^a-z0-9 ]+", "", unidecode.unidecode(str(x).lower()))
+        # Keep names as Python strings: a fixed-width unicode array would take
+        # rows x longest name x 4 bytes, so one junk value could need gigabytes
+        names = df[name_column].astype(str).to_numpy(dtype=object)
+        
+        # Clean names (remove special characters and normalize) and encode
+        # characters to numbers (a=1, b=2, ..., space=0)
+        encoded_names = np.empty((len(names), _NAME_LENGTH), dtype=np.float32)
+        if numba is not None:
+            clean_names = _fold_clean_encode(names, encoded_names)
+        else:
+            clean_names = _clean_names(names)
+            _encode_names(clean_names, encoded_names)
+        
+        # First names repeat heavily, so store them as categories: a million
+        # rows over a few thousand names take a few MB of codes instead of
+        # tens of MB of strings, and factorizing them later needs no hashing
+        clean_names = pd.Series(
+            clean_names, index=df.index, dtype='category', name='clean_name_nlp'
         )
         
-        # Transform names to character arrays
-        transformed_names = [list(name) for name in clean_names]
+        # Neither value is added to df, so the result never carries (or has
+        # to drop) intermediate columns
+        return clean_names, encoded_names
+    
+    def _predict(
+        self,
+        df: pd.DataFrame,
+        clean_names: pd.Series,
+        input_data: np.ndarray,
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+    ) -> pd.DataFrame:
+        """
+        Make gender predictions using the loaded model.
         
-        # Pad names to fixed length
-        name_length = 50
-        padded_names = [
-            (name + [' '] * name_length)[:name_length] 
-            for name in transformed_names
-        ]
+        Args:
+            df: DataFrame the predictions are added to
+            clean_names: Clean names of df, used to skip repeated names
+            input_data: Array of shape (n, 50) with the encoded names of df
+            batch_size: Maximum number of names sent to the model at once
         
-        # Encode characters to numbers (a=1, b=2, ..., space=0)
-        encoded_names = [
-            [max(0.0, ord(char) - 96.0) for char in name] 
-            for name in padded_names
-        ]
+        Returns:
+            DataFrame with prediction results
+        """
+        # Run the model once per distinct clean name and scatter back to rows
+        codes, uniques = pd.factorize(clean_names)
+        
+        # Scatter row numbers in reverse so each name keeps its first row,
+        # without sorting all n codes as np.unique would
+        first_rows = np.empty(len(uniques), dtype=np.intp)
+        first_rows[codes[::-1]] = np.arange(len(codes))[::-1]
+        unique_labels, unique_percents = self._run_model(
+            input_data[first_rows], batch_size
+        )
         
-        # Add preprocessing columns
-        df_copy['clean_name_nlp'] = clean_names
-        df_copy['transform_name_nlp'] = encoded_names
+        # Labels come back as ASCII codes and probabilities as percentages
+        gender_labels = unique_labels[codes].view('S1').astype(str)
+        gender_probs = unique_percents[codes] / 100.0
         
-        return df_copy
+        # Add results to a new DataFrame
+        return df.assign(
+            gender_predicted=gender_labels,
+            gender_probability=gender_probs,
+        )
     
-    def _predict(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _run_model(
+        self, input_data: np.ndarray, batch_size: int = _DEFAULT_BATCH_SIZE
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Make gender predictions using the loaded model.
+        Run the model on encoded names in batches.
         
         Args:
-            df: DataFrame with preprocessed name data
+            input_data: Array of shape (n, 50) with encoded names
+            batch_size: Maximum number of names sent to the model at once
         
         Returns:
-            DataFrame with prediction results
+            Tuple of uint8 arrays of shape (n,) with the ASCII code of the
+            predicted gender and its probability as a whole percentage
+        """
+        if len(input_data) == 0:
+            return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.uint8)
+        
+        if self._interpreter is None:
+            import tensorflow as tf
+            
+            # Feed slices of the array so only one batch at a time is copied
+            # into a tensor, as the TensorFlow Lite branch below does
+            input_data = input_data.astype(np.float32, copy=False)
+            batches = (
+                input_data[start:start + batch_size]
+                for start in range(0, len(input_data), batch_size)
+            )
+            if self._jit_compile:
+                # The last batch size follows the number of distinct names,
+                # which changes on almost every call; padding it to a power
+                # of two keeps the number of XLA compilations logarithmic in
+                # batch_size. Without XLA the input signature already avoids
+                # retracing, so batches are passed as they are.
+                batches = (_pad_batch(batch, batch_size) for batch in batches)
+            labels, percents = zip(*(self._predict_fn(batch) for batch in batches))
+            
+            # Results stay on the device until the single copy of each output
+            labels = tf.concat(labels, 0)[:len(input_data)]
+            percents = tf.concat(percents, 0)[:len(input_data)]
+            return labels.numpy(), percents.numpy()
+        
+        predictions = [
+            self._invoke_interpreter(input_data[start:start + batch_size])
+            for start in range(0, len(input_data), batch_size)
+        ]
+        return _summarize_predictions(np.concatenate(predictions).squeeze(axis=1))
+    
+    def _invoke_interpreter(self, input_data: np.ndarray) -> np.ndarray:
         """
-        # Convert to numpy array for model input
-        input_data = np.asarray(df['transform_name_nlp'].values.tolist())
+        Run the TensorFlow Lite interpreter on a single batch.
         
-        # Make predictions
-        predictions = self._model.predict(input_data).squeeze(axis=1)
+        Args:
+            input_data: Array of shape (n, 50) with encoded names
         
-        # Convert predictions to gender labels and probabilities
-        gender_labels = ['M' if prob > 0.5 else 'F' for prob in predictions]
-        gender_probs = [
-            prob if prob > 0.5 else 1.0 - prob 
-            for prob in predictions
-        ]
+        Returns:
+            Array of shape (n, 1) with the model output for each name
+        """
+        input_details = self._input_details
+        output_details = self._output_details
+        
+        if input_details['dtype'] == np.int8:
+            # Quantized model: map encoded values onto the int8 input scale
+            scale, zero_point = input_details['quantization']
+            input_data = np.clip(np.round(input_data / scale + zero_point), -128, 127)
+        
+        # Every batch but the last has the same shape, so tensors are only
+        # reallocated when the batch size changes
+        if input_data.shape != self._interpreter_shape:
+            self._interpreter.resize_tensor_input(
+                input_details['index'], input_data.shape
+            )
+            self._interpreter.allocate_tensors()
+            self._interpreter_shape = input_data.shape
+        
+        self._interpreter.set_tensor(
+            input_details['index'], input_data.astype(input_details['dtype'])
+        )
+        self._interpreter.invoke()
         
-        # Add results to DataFrame
-        df_result = df.copy()
-        df_result['gender_predicted'] = gender_labels
-        df_result['gender_probability'] = [round(prob, 2) for prob in gender_probs]
+        output = self._interpreter.get_tensor(output_details['index'])
+        if output_details['dtype'] == np.int8:
+            scale, zero_point = output_details['quantization']
+            output = (output.astype(np.float32) - zero_point) * scale
         
-        return df_result 
\ No newline at end of file
+        return output
@@ -1,6 +1,21 @@
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
 import os
 
+# Compile the Cython encoder (Cython is a build requirement in pyproject.toml).
+# The extension is optional: if Cython is missing in a legacy build or there is
+# no C compiler, the package falls back to a pure NumPy/Numba implementation
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("latam_genderize._encode", ["latam_genderize/_encode.pyx"])],
+        language_level=3,
+    )
+    # Set after cythonize, which rebuilds the Extension objects
+    for ext in ext_modules:
+        ext.optional = True
+except ImportError:
+    ext_modules = []
+
 # Read the README file
 def read_readme():
     with open("README.md", "r", encoding="utf-8") as fh:
@@ -24,6 +39,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/latam-gender-predictor",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -45,9 +61,11 @@ setup(
         "pandas>=1.0.0",
         "numpy>=1.18.0",
         "unidecode>=1.0.0",
-        "pyspark>=3.0.0",
     ],
     extras_require={
+        "fast": [
+            "numba>=0.50.0",
+        ],
         "dev": [
             "pytest>=6.0.0",
             "pytest-cov>=2.0.0",
@@ -58,7 +76,7 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "latam_genderize": ["models/*.h5"],
+        "latam_genderize": ["models/*.h5", "models/*.tflite"],
     },
     zip_safe=False,
     keywords="gender prediction, machine learning, latin america, names, tensorflow",
@@ -3,14 +3,49 @@ Tests for the LatamGenderize module.
 """
 
 import os
+import subprocess
+import sys
 import tempfile
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 
 import numpy as np
 import pandas as pd
+import tensorflow as tf
 
 from latam_genderize import LatamGenderize
+from latam_genderize import genderize as genderize_module
+
+
+def _save_small_model(directory):
+    """Save a small untrained name model to directory and return its path."""
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input((50,)),
+        tf.keras.layers.Embedding(27, 4),
+        tf.keras.layers.GlobalAveragePooling1D(),
+        tf.keras.layers.Dense(1, activation='sigmoid'),
+    ])
+    model_path = os.path.join(directory, 'model.h5')
+    model.save(model_path)
+    return model_path
+
+
+def _bare_genderizer(predict_fn=None, jit_compile=True):
+    """Build a LatamGenderize without a model that runs predict_fn for inference."""
+    genderizer = LatamGenderize.__new__(LatamGenderize)
+    genderizer._jit_compile = jit_compile
+    genderizer._interpreter = None
+    genderizer._predict_fn = predict_fn
+    return genderizer
+
+
+def _genderizer_with_model(model, **kwargs):
+    """Build a LatamGenderize around model instead of loading the model file."""
+    with patch('tensorflow.keras.models.load_model') as mock_load, \
+            patch('latam_genderize.genderize.os.path.exists') as mock_exists:
+        mock_load.return_value = model
+        mock_exists.return_value = True
+        return LatamGenderize(**kwargs)
 
 
 class TestLatamGenderize(unittest.TestCase):
@@ -18,9 +53,8 @@ class TestLatamGenderize(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        # Create a mock model for testing
-        self.mock_model = Mock()
-        self.mock_model.predict.return_value = np.array([[0.7], [0.3], [0.8]])
+        # Create a mock model for testing; inference calls the model directly
+        self.mock_model = Mock(return_value=np.array([[0.7], [0.3], [0.8]], np.float32))
         
         # Sample test data
         self.test_df = pd.DataFrame({
@@ -30,7 +64,7 @@ class TestLatamGenderize(unittest.TestCase):
 
     def test_init_with_default_model(self):
         """Test initialization with default model path."""
-        with patch('latam_genderize.genderize.load_model') as mock_load:
+        with patch('tensorflow.keras.models.load_model') as mock_load:
             mock_load.return_value = self.mock_model
             
             genderizer = LatamGenderize()
@@ -47,7 +81,7 @@ class TestLatamGenderize(unittest.TestCase):
         """Test initialization with custom model path."""
         custom_path = "/path/to/custom/model.h5"
         
-        with patch('latam_genderize.genderize.load_model') as mock_load:
+        with patch('tensorflow.keras.models.load_model') as mock_load:
             mock_load.return_value = self.mock_model
             
             genderizer = LatamGenderize(model_path=custom_path)
@@ -63,6 +97,14 @@ class TestLatamGenderize(unittest.TestCase):
             with self.assertRaises(FileNotFoundError):
                 LatamGenderize()
 
+    def test_import_does_not_load_tensorflow(self):
+        """Test that importing the package does not initialize TensorFlow."""
+        code = "import sys, latam_genderize; sys.exit('tensorflow' in sys.modules)"
+        root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        
+        result = subprocess.run([sys.executable, '-c', code], cwd=root_dir)
+        self.assertEqual(result.returncode, 0)
+
     def test_identify_column_name_name(self):
         """Test automatic column identification with 'name' column."""
         genderizer = LatamGenderize.__new__(LatamGenderize)
@@ -97,38 +139,164 @@ class TestLatamGenderize(unittest.TestCase):
 
     def test_preprocess_names(self):
         """Test name preprocessing functionality."""
-        genderizer = LatamGenderize.__new__(LatamGenderize)
+        genderizer = _bare_genderizer()
         
         df = pd.DataFrame({'name': ['Juan-Pérez', 'María José', 'Carlos123']})
-        result = genderizer._preprocess(df, 'name')
-        
-        # Check that preprocessing columns were added
-        self.assertIn('clean_name_nlp', result.columns)
-        self.assertIn('transform_name_nlp', result.columns)
+        clean_names, encoded = genderizer._preprocess(df, 'name')
         
         # Check that names were cleaned
         expected_clean = ['juanperez', 'maria jose', 'carlos123']
-        self.assertEqual(result['clean_name_nlp'].tolist(), expected_clean)
+        self.assertEqual(clean_names.tolist(), expected_clean)
+        self.assertIsInstance(clean_names.dtype, pd.CategoricalDtype)
+        self.assertTrue(clean_names.index.equals(df.index))
         
         # Check that names were transformed to character arrays
-        self.assertEqual(len(result['transform_name_nlp'].iloc[0]), 50)
+        self.assertEqual(encoded.shape, (3, 50))
+        
+        # Check that the input DataFrame was not modified
+        self.assertEqual(df.columns.tolist(), ['name'])
+
+    def test_preprocess_encoding(self):
+        """Test character encoding and padding of cleaned names."""
+        genderizer = _bare_genderizer()
+        
+        df = pd.DataFrame({'name': ['Ana Z9', 'x' * 60]})
+        _, encoded = genderizer._preprocess(df, 'name')
+        
+        self.assertEqual(encoded.shape, (2, 50))
+        self.assertEqual(encoded.dtype, np.float32)
+        
+        # a=1, n=14, space and digits=0, z=26, padding=0
+        np.testing.assert_array_equal(encoded[0, :6], [1, 14, 1, 0, 26, 0])
+        self.assertTrue((encoded[0, 6:] == 0).all())
+        
+        # Long names are truncated to the fixed length
+        self.assertTrue((encoded[1] == 24).all())
+
+    def test_preprocess_long_outlier_name(self):
+        """Test that one very long name does not widen the other rows."""
+        genderizer = _bare_genderizer()
+        
+        df = pd.DataFrame({'name': ['Ana', 'Ñoño ' + 'z' * 5000, 'Eva']})
+        clean_names, encoded = genderizer._preprocess(df, 'name')
+        
+        self.assertEqual(clean_names.tolist(), ['ana', 'nono ' + 'z' * 5000, 'eva'])
+        self.assertEqual(encoded.shape, (3, 50))
+        np.testing.assert_array_equal(encoded[1, :5], [14, 15, 14, 15, 0])
+        self.assertTrue((encoded[1, 5:] == 26).all())
+        np.testing.assert_array_equal(encoded[2, :3], [5, 22, 1])
+
+    def test_encode_ascii_matches_numpy(self):
+        """Test that the active ASCII encoder matches the NumPy implementation."""
+        padded_names = ''.join(
+            name.ljust(50) for name in ['ana maria', 'z9 x', '', 'abc' * 16]
+        )
+        buf = np.frombuffer(padded_names.encode('ascii'), dtype=np.uint8)
+        
+        encoded = np.empty((4, 50), dtype=np.float32)
+        expected = np.empty_like(encoded)
+        genderize_module._encode_ascii(buf, encoded)
+        genderize_module._encode_ascii_numpy(buf, expected)
+        
+        np.testing.assert_array_equal(encoded, expected)
+
+    @unittest.skipIf(
+        genderize_module._encode_batch is None, "compiled encoder is not built"
+    )
+    def test_encode_batch_matches_encode_ascii(self):
+        """Test that the compiled encoder matches the NumPy/Numba encoder."""
+        from latam_genderize import _encode
+        
+        names = ['ana maria', 'z9 x', '', 'x' * 60]
+        encoded = np.empty((len(names), 50), dtype=np.float32)
+        _encode.encode_batch(names, encoded)
+        
+        # Long names are truncated and empty names are all padding
+        padded_names = ''.join(name.ljust(50)[:50] for name in names)
+        buf = np.frombuffer(padded_names.encode('ascii'), dtype=np.uint8)
+        expected = np.empty_like(encoded)
+        genderize_module._encode_ascii(buf, expected)
+        
+        np.testing.assert_array_equal(encoded, expected)
+        self.assertTrue((encoded[2] == 0).all())
+        self.assertTrue((encoded[3] == 24).all())
+        
+        with self.assertRaises(ValueError):
+            _encode.encode_batch(names[:2], encoded)
+
+    def test_preprocess_matches_without_numba(self):
+        """Test that preprocessing gives the same result without numba."""
+        genderizer = _bare_genderizer()
+        df = pd.DataFrame(
+            {'name': ['Juan-Pérez', 'MARÍA JOSÉ', 'Zoë 李', '', 'x' * 60]}
+        )
+        
+        clean_names, encoded = genderizer._preprocess(df, 'name')
+        
+        with patch.object(genderize_module, 'numba', None), \
+                patch.object(genderize_module, '_encode_batch', None), \
+                patch.object(
+                    genderize_module, '_encode_ascii',
+                    genderize_module._encode_ascii_numpy,
+                ):
+            expected_clean, expected_encoded = genderizer._preprocess(df, 'name')
+        
+        self.assertEqual(clean_names.tolist(), expected_clean.tolist())
+        np.testing.assert_array_equal(encoded, expected_encoded)
+
+    @unittest.skipIf(genderize_module.numba is None, "numba is not installed")
+    def test_fold_clean_encode_matches_pipeline(self):
+        """Test that single-pass cleaning matches the unidecode pipeline."""
+        names = np.array([
+            'Juan-Pérez', 'MARÍA JOSÉ', 'Ñoño', 'Æsir ß ¼', 'Zoë 李', '',
+            'x' * 60, 'y' * 50, '¼' * 20,
+        ], dtype=object)
+        
+        encoded = np.empty((len(names), 50), dtype=np.float32)
+        clean_names = genderize_module._fold_clean_encode(names, encoded)
+        
+        expected_encoded = np.empty_like(encoded)
+        expected_clean = genderize_module._clean_names(names)
+        genderize_module._encode_names(expected_clean, expected_encoded)
+        
+        self.assertEqual(clean_names.tolist(), expected_clean.tolist())
+        np.testing.assert_array_equal(encoded, expected_encoded)
+
+    def test_preprocess_empty_dataframe(self):
+        """Test preprocessing and prediction on a DataFrame without rows."""
+        genderizer = _bare_genderizer(Mock())
+        
+        df = pd.DataFrame({'name': pd.Series([], dtype=object)})
+        clean_names, encoded = genderizer._preprocess(df, 'name')
+        
+        self.assertEqual(len(clean_names), 0)
+        self.assertEqual(encoded.shape, (0, 50))
+        
+        result = genderizer.genderize(df)
+        
+        genderizer._predict_fn.assert_not_called()
+        self.assertEqual(len(result), 0)
+        self.assertIn('gender_predicted', result.columns)
+        self.assertIn('gender_probability', result.columns)
 
     def test_predict_gender(self):
         """Test gender prediction functionality."""
-        genderizer = LatamGenderize.__new__(LatamGenderize)
-        genderizer._model = self.mock_model
+        # Device outputs for model predictions [0.7, 0.3, 0.8]
+        genderizer = _bare_genderizer(Mock(return_value=(
+            tf.constant([ord('M'), ord('F'), ord('M')], tf.uint8),
+            tf.constant([70, 70, 80], tf.uint8),
+        )))
         
-        # Create test data with preprocessing columns
-        df = pd.DataFrame({
-            'name': ['Juan', 'Maria', 'Carlos'],
-            'transform_name_nlp': [
-                [1, 2, 3] + [0] * 47,  # Mock encoded name
-                [4, 5, 6] + [0] * 47,
-                [7, 8, 9] + [0] * 47
-            ]
-        })
+        # Create test data with preprocessed names
+        df = pd.DataFrame({'name': ['Juan', 'Maria', 'Carlos']})
+        clean_names = pd.Series(['juan', 'maria', 'carlos'])
+        input_data = np.array([
+            [1, 2, 3] + [0] * 47,  # Mock encoded name
+            [4, 5, 6] + [0] * 47,
+            [7, 8, 9] + [0] * 47
+        ], dtype=np.float32)
         
-        result = genderizer._predict(df)
+        result = genderizer._predict(df, clean_names, input_data)
         
         # Check that prediction columns were added
         self.assertIn('gender_predicted', result.columns)
@@ -137,10 +305,196 @@ class TestLatamGenderize(unittest.TestCase):
         # Check predictions based on mock model output
         expected_genders = ['M', 'F', 'M']  # Based on [0.7, 0.3, 0.8]
         self.assertEqual(result['gender_predicted'].tolist(), expected_genders)
+        
+        # Probabilities refer to the predicted gender and are rounded
+        np.testing.assert_allclose(
+            result['gender_probability'], [0.7, 0.7, 0.8], atol=1e-6
+        )
+
+    def test_predict_deduplicates_names(self):
+        """Test that the model only runs once per distinct clean name."""
+        genderizer = _bare_genderizer(Mock(return_value=(
+            tf.constant([ord('M'), ord('F')], tf.uint8),
+            tf.constant([90, 80], tf.uint8),
+        )))
+        
+        df = pd.DataFrame({'name': ['Juan', 'María', 'juan', 'Maria', 'JUAN']})
+        clean_names, input_data = genderizer._preprocess(df, 'name')
+        result = genderizer._predict(df, clean_names, input_data)
+        
+        # Only the two distinct names reach the model, in order of appearance
+        model_input = genderizer._predict_fn.call_args[0][0]
+        self.assertEqual(model_input.shape, (2, 50))
+        self.assertEqual(model_input[0, 0], 10)  # 'j'
+        self.assertEqual(model_input[1, 0], 13)  # 'm'
+        
+        self.assertEqual(
+            result['gender_predicted'].tolist(), ['M', 'F', 'M', 'F', 'M']
+        )
+
+    def test_predict_fn_calls_model_directly(self):
+        """Test that inference bypasses Model.predict."""
+        model = Mock(return_value=np.array([[0.7], [0.3], [0.8]], np.float32))
+        
+        genderizer = _genderizer_with_model(model)
+        result = genderizer.genderize(self.test_df)
+        
+        model.predict.assert_not_called()
+        self.assertFalse(model.call_args[1]['training'])
+        self.assertEqual(result['gender_predicted'].tolist(), ['M', 'F', 'M'])
+
+    def test_predict_fn_thresholds_on_device(self):
+        """Test that the predict function returns compact labels and percentages."""
+        model = Mock(return_value=np.array([[0.7], [0.3], [0.856]], np.float32))
+        
+        genderizer = _genderizer_with_model(model)
+        labels, percents = genderizer._predict_fn(tf.zeros([3, 50]))
+        
+        self.assertEqual(labels.dtype, tf.uint8)
+        self.assertEqual(percents.dtype, tf.uint8)
+        self.assertEqual(bytes(labels.numpy()), b'MFM')
+        self.assertEqual(percents.numpy().tolist(), [70, 70, 86])
+
+    def test_init_without_jit_compile(self):
+        """Test that XLA compilation can be disabled."""
+        model = Mock(return_value=np.array([[0.7], [0.3], [0.8]], np.float32))
+        
+        with patch('tensorflow.function', wraps=tf.function) as mock_function:
+            genderizer = _genderizer_with_model(model, jit_compile=False)
+        result = genderizer.genderize(self.test_df)
+        
+        self.assertFalse(mock_function.call_args[1]['jit_compile'])
+        self.assertFalse(model.call_args[1]['training'])
+        self.assertEqual(result['gender_predicted'].tolist(), ['M', 'F', 'M'])
+
+    def test_predict_in_batches(self):
+        """Test that inference is split into batches of at most batch_size."""
+        genderizer = _bare_genderizer(Mock(side_effect=lambda batch: (
+            tf.fill([tf.shape(batch)[0]], tf.constant(ord('M'), tf.uint8)),
+            tf.fill([tf.shape(batch)[0]], tf.constant(90, tf.uint8)),
+        )))
+        
+        df = pd.DataFrame({'name': ['Ana', 'Juan', 'Luis', 'Sara', 'Eva']})
+        clean_names, input_data = genderizer._preprocess(df, 'name')
+        result = genderizer._predict(df, clean_names, input_data, batch_size=2)
+        
+        calls = genderizer._predict_fn.call_args_list
+        batch_sizes = [call[0][0].shape[0] for call in calls]
+        self.assertEqual(batch_sizes, [2, 2, 1])
+        self.assertEqual(len(result), 5)
+
+    def test_predict_pads_last_batch(self):
+        """Test that the last batch is padded to a power of two and sliced back."""
+        genderizer = _bare_genderizer(Mock(side_effect=lambda batch: (
+            tf.fill([tf.shape(batch)[0]], tf.constant(ord('F'), tf.uint8)),
+            tf.fill([tf.shape(batch)[0]], tf.constant(60, tf.uint8)),
+        )))
+        
+        df = pd.DataFrame(
+            {'name': ['Ana', 'Juan', 'Luis', 'Sara', 'Eva', 'Ivan', 'Rosa']}
+        )
+        clean_names, input_data = genderizer._preprocess(df, 'name')
+        result = genderizer._predict(df, clean_names, input_data, batch_size=4)
+        
+        calls = genderizer._predict_fn.call_args_list
+        batch_sizes = [call[0][0].shape[0] for call in calls]
+        self.assertEqual(batch_sizes, [4, 4])
+        
+        # Padding rows are all zeros and never reach the result
+        last_batch = calls[-1][0][0]
+        self.assertTrue((last_batch[3:] == 0).all())
+        self.assertEqual(result['gender_predicted'].tolist(), ['F'] * 7)
+
+    def test_predict_skips_padding_without_jit(self):
+        """Test that batches are not padded when XLA compilation is off."""
+        genderizer = _bare_genderizer(Mock(side_effect=lambda batch: (
+            tf.fill([tf.shape(batch)[0]], tf.constant(ord('M'), tf.uint8)),
+            tf.fill([tf.shape(batch)[0]], tf.constant(90, tf.uint8)),
+        )), jit_compile=False)
+        
+        df = pd.DataFrame(
+            {'name': ['Ana', 'Juan', 'Luis', 'Sara', 'Eva', 'Ivan', 'Rosa']}
+        )
+        clean_names, input_data = genderizer._preprocess(df, 'name')
+        result = genderizer._predict(df, clean_names, input_data, batch_size=4)
+        
+        calls = genderizer._predict_fn.call_args_list
+        batch_sizes = [call[0][0].shape[0] for call in calls]
+        self.assertEqual(batch_sizes, [4, 3])
+        self.assertEqual(len(result), 7)
+
+    def test_genderize_invalid_batch_size(self):
+        """Test genderize with a non-positive batch size."""
+        genderizer = LatamGenderize.__new__(LatamGenderize)
+        
+        with self.assertRaises(ValueError):
+            genderizer.genderize(self.test_df, batch_size=0)
+
+    def test_genderize_with_tflite(self):
+        """Test that the TensorFlow Lite path matches the TensorFlow path."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = _save_small_model(tmp_dir)
+            
+            genderizer = LatamGenderize(model_path=model_path)
+            tflite_genderizer = LatamGenderize(model_path=model_path, use_tflite=True)
+            
+            # The converted model is cached next to the original one, and the
+            # temporary file it is written through is renamed into place
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'model.tflite')))
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)), ['model.h5', 'model.tflite']
+            )
+            
+            expected = genderizer.genderize(self.test_df)
+            result = tflite_genderizer.genderize(self.test_df)
+        
+        np.testing.assert_allclose(
+            result['gender_probability'], expected['gender_probability'], atol=0.01
+        )
+
+    def test_tflite_reallocates_only_on_new_shapes(self):
+        """Test that interpreter tensors are only reallocated on new batch sizes."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = _save_small_model(tmp_dir)
+            
+            genderizer = LatamGenderize(model_path=model_path, use_tflite=True)
+            interpreter = genderizer._interpreter
+            
+            with patch.object(
+                interpreter, 'allocate_tensors', wraps=interpreter.allocate_tensors
+            ) as mock_allocate:
+                # Three batches of one name share a single allocation
+                result = genderizer.genderize(self.test_df, batch_size=1)
+                self.assertEqual(mock_allocate.call_count, 1)
+                
+                # A new batch size reallocates once
+                genderizer.genderize(self.test_df, batch_size=3)
+                self.assertEqual(mock_allocate.call_count, 2)
+        
+        self.assertEqual(len(result), 3)
+
+    def test_genderize_quantized(self):
+        """Test the int8-quantized TensorFlow Lite path."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = _save_small_model(tmp_dir)
+            
+            genderizer = LatamGenderize(model_path=model_path)
+            quantized_genderizer = LatamGenderize(model_path=model_path, quantized=True)
+            
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'model_int8.tflite')))
+            input_details = quantized_genderizer._interpreter.get_input_details()[0]
+            self.assertEqual(input_details['dtype'], np.int8)
+            
+            expected = genderizer.genderize(self.test_df)
+            result = quantized_genderizer.genderize(self.test_df)
+        
+        np.testing.assert_allclose(
+            result['gender_probability'], expected['gender_probability'], atol=0.05
+        )
 
     def test_genderize_complete_flow(self):
         """Test the complete genderize workflow."""
-        with patch('latam_genderize.genderize.load_model') as mock_load:
+        with patch('tensorflow.keras.models.load_model') as mock_load:
             mock_load.return_value = self.mock_model
             
             genderizer = LatamGenderize()
@@ -162,7 +516,7 @@ class TestLatamGenderize(unittest.TestCase):
 
     def test_genderize_with_specified_column(self):
         """Test genderize with explicitly specified column name."""
-        with patch('latam_genderize.genderize.load_model') as mock_load:
+        with patch('tensorflow.keras.models.load_model') as mock_load:
             mock_load.return_value = self.mock_model
             
             genderizer = LatamGenderize()
@@ -175,7 +529,7 @@ class TestLatamGenderize(unittest.TestCase):
 
     def test_genderize_column_not_found(self):
         """Test genderize when specified column is not found."""
-        with patch('latam_genderize.genderize.load_model') as mock_load:
+        with patch('tensorflow.keras.models.load_model') as mock_load:
             mock_load.return_value = self.mock_model
             
             genderizer = LatamGenderize()
@@ -185,7 +539,7 @@ class TestLatamGenderize(unittest.TestCase):
 
     def test_load_model_error(self):
         """Test error handling when loading model fails."""
-        with patch('latam_genderize.genderize.load_model') as mock_load:
+        with patch('tensorflow.keras.models.load_model') as mock_load:
             mock_load.side_effect = Exception("Model loading failed")
             
             with self.assertRaises(Exception):